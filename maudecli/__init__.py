@@ -8,6 +8,7 @@ import argparse
 import json
 import logging
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 # Local imports
@@ -22,6 +23,29 @@ from maudecli.errors import (
 from maudecli.formatters import as_csv, as_org
 
 logger = logging.getLogger(__name__)
+# Library users configure logging themselves, main() attaches the CLI handler
+logger.addHandler(logging.NullHandler())
+
+_CONFIGURED = False
+
+# Map common API field names to local DB field names
+_LOCAL_FIELD_MAP = {
+    "mdr_text.text": "foi_text",
+    "device.device_name": "generic_name",
+    "device.brand_name": "brand_name",
+}
+
+
+def _configure_logging() -> None:
+    """Attach the CLI log handler to the package logger (once per process)."""
+    global _CONFIGURED  # noqa: PLW0603
+    if _CONFIGURED:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    logger.addHandler(handler)
+    _CONFIGURED = True
 
 
 def main() -> None:
@@ -97,9 +121,18 @@ def main() -> None:
         default=None,
         help="API Key for the OpenFDA. Once provided, will save for future use.",
     )
+    parser.add_argument(
+        "-v", "--verbose",
+        action="count",
+        default=0,
+        help="Increase logging verbosity (-v for info, -vv for debug)",
+    )
 
     args = parser.parse_args()
 
+    _configure_logging()
+    logger.setLevel(max(logging.WARNING - 10 * args.verbose, logging.DEBUG))
+
     # Save the API Key if provided
     if args.api_key:
         set_api_key(args.api_key)
@@ -175,28 +208,24 @@ def main() -> None:
         )
         sys.exit(5)
 
+    fields = args.fields.split(",") if args.fields else None
+
     # Also query local database for pre-2009 data if available
     if database_exists():
         logger.info("Querying local database for historical data...")
         # Use the first search field for local DB query
-        search_field = (
-            args.search_fields.split(",")[0]
-            if "," in args.search_fields
-            else args.search_fields
+        search_field = args.search_fields.partition(",")[0]
+        local_field = _LOCAL_FIELD_MAP.get(
+            search_field, search_field.rpartition(".")[2],
         )
-        # Map common API field names to local DB field names
-        field_mapping = {
-            "mdr_text.text": "foi_text",
-            "device.device_name": "generic_name",
-            "device.brand_name": "brand_name",
-        }
-        local_field = field_mapping.get(search_field, search_field.split(".")[-1])
 
         local_results = query_local_database(
             terms,
             exclude_terms=exclude_terms,
             search_field=local_field,
             limit=args.limit if args.max_pages == 1 else None,
+            # Only fetch the columns that will be output (and the item name)
+            columns=[*fields, args.name] if fields else None,
         )
         if local_results:
             logger.info(f"Found {len(local_results)} results in local database")
@@ -220,7 +249,12 @@ def main() -> None:
         args.format = output.suffix[1:]
 
     # Format output
-    fields = args.fields.split(",") if args.fields else None
+    if args.format == "csv":
+        # Stream rows to the destination rather than building one string
+        with output.open("w") if output else nullcontext(sys.stdout) as fp:
+            as_csv(results, fields=fields, sink=fp)
+        return
+
     match args.format:
         case "org":
             output_str = as_org(
@@ -228,8 +262,6 @@ def main() -> None:
             )
         case "json":
             output_str = json.dumps(results, indent=2)
-        case "csv":
-            output_str = as_csv(results, fields=fields)
         case _: # Text
             output_str = ""
             for i, r in enumerate(results, 1):
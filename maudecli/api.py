@@ -10,12 +10,23 @@ if TYPE_CHECKING:
 
 # Python imports
 import configparser
+import http.client
+import io
 import json
 import logging
+import os
+import urllib.error
 import urllib.request
 from pathlib import Path
 from typing import Generator, Iterable
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urljoin, urlsplit
+
+# Module imports
+try:
+    import orjson  # type: ignore[import-not-found]
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _loads = json.loads
 
 # Local imports
 from maudecli.errors import (
@@ -30,6 +41,15 @@ logger = logging.getLogger(__name__)
 
 _CONFIG_PATH = Path.home() / ".maudecli" / "config.ini"
 
+# Keep-alive connections keyed by (scheme, netloc) so paginated requests reuse
+# the same TCP/TLS session instead of re-handshaking for every page.
+_CONNECTIONS: dict[tuple[str, str], http.client.HTTPConnection] = {}
+# Seconds to wait on a socket, so a silently dropped keep-alive connection
+# fails (and is retried) instead of blocking forever
+_TIMEOUT = 60
+# Redirects followed per request, as urllib.request.urlopen does
+_MAX_REDIRECTS = 10
+
 def get_api_key() -> str | None:
     """Get the API key - if set."""
     config = configparser.ConfigParser()
@@ -53,13 +73,77 @@ def set_api_key(key: str) -> None:
 
     # Ensure the configuration directory is only accessible by the user.
     _CONFIG_PATH.parent.mkdir(mode=0o700, exist_ok=True)
-    with _CONFIG_PATH.open("w") as configfile:
+
+    # Write a temporary file, created only readable/writable by the user, and
+    # swap it in so readers never see a partially written configuration.
+    tmp_path = _CONFIG_PATH.with_name(_CONFIG_PATH.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as configfile:
         config.write(configfile)
-    # Ensure the configuration file is only readable/writable by the user.
-    _CONFIG_PATH.chmod(0o600)
+    tmp_path.chmod(0o600)
+    os.replace(tmp_path, _CONFIG_PATH)
     logger.info("API Key saved to %s", _CONFIG_PATH.as_posix())
 
 
+def _urlopen(
+        url: str, redirects: int = _MAX_REDIRECTS,
+) -> http.client.HTTPResponse:
+    """Open a URL, reusing a persistent connection to its host.
+
+    Behaves like ``urllib.request.urlopen`` for the parts ``fetch_results``
+    relies on: redirects are followed (up to ``redirects`` times), error
+    statuses raise ``urllib.error.HTTPError`` and connection failures,
+    including timeouts, raise ``urllib.error.URLError``. If a proxy is
+    configured the request is delegated to ``urllib.request.urlopen``.
+
+    """
+    if urllib.request.getproxies():
+        return urllib.request.urlopen(url, timeout=_TIMEOUT)  # noqa: S310
+
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+    # Retry once on a fresh connection in case the server dropped the idle one
+    for attempt in range(2):
+        conn = _CONNECTIONS.get(key)
+        if conn is None:
+            conn_cls = (
+                http.client.HTTPSConnection
+                if parts.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = _CONNECTIONS[key] = conn_cls(parts.netloc, timeout=_TIMEOUT)
+        try:
+            conn.request("GET", path, headers={"User-Agent": "maude-cli"})
+            response = conn.getresponse()
+            break
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            del _CONNECTIONS[key]
+            if attempt:
+                raise urllib.error.URLError(e) from e
+
+    if 300 <= response.status < 400:  # noqa: PLR2004
+        location = urljoin(url, response.getheader("Location") or "")
+        # Drain the body so the connection can be reused by the next request
+        body = io.BytesIO(response.read())
+        if redirects > 0 and location != url and location.startswith(
+            ("http:", "https:"),
+        ):
+            return _urlopen(location, redirects - 1)
+        raise urllib.error.HTTPError(
+            url, response.status, response.reason, response.headers, body,
+        )
+    if response.status >= 400:  # noqa: PLR2004
+        # Drain the body so the connection can be reused by the next request
+        body = io.BytesIO(response.read())
+        raise urllib.error.HTTPError(
+            url, response.status, response.reason, response.headers, body,
+        )
+    return response
+
+
 def construct_url(
         base_url: str,
         query: str,
@@ -95,6 +179,21 @@ def _validate_search_terms(
     return keywords
 
 
+def _canonicalize_search_terms(keywords: list[list[str]]) -> list[list[str]]:
+    """Canonicalize term groups so equivalent searches build the same URL.
+
+    Terms are stripped of surrounding whitespace, blank terms are dropped and
+    each group is de-duplicated and sorted. Groups are AND'd together so they
+    are de-duplicated and sorted as well. Case is preserved because openFDA
+    ``.exact`` fields are case-sensitive.
+    """
+    groups = {
+        tuple(sorted({term.strip() for term in group if term.strip()}))
+        for group in keywords
+    }
+    return [list(group) for group in sorted(groups) if group]
+
+
 def fetch_results(
         *terms: Iterable[str] | str,
         exclude_terms: Sequence[Sequence[str]] | None = None,
@@ -103,6 +202,7 @@ def fetch_results(
         max_pages: int = 0,
         limit: int = 1000,
         sort: None | str = None,
+        preserve_order: bool = False,
 ) -> list[dict]:
     """Fetch and filter query results from the endpoint.
 
@@ -126,6 +226,9 @@ def fetch_results(
         limit : Maximum number of results per query page.
             Defaults to 1000.
         sort : Sort criteria for results. Defaults to None.
+        preserve_order : If True, send the terms exactly as given instead of
+            canonicalizing them (stripped, de-duplicated and sorted).
+            Defaults to False.
 
     Returns:
         results : A list of dictionaries containing the filtered JSON results.
@@ -145,6 +248,8 @@ def fetch_results(
     )
 
     keywords = _validate_search_terms(terms)
+    if not preserve_order:
+        keywords = _canonicalize_search_terms(keywords)
     search_fields = (
         [search_fields]
         if isinstance(search_fields, str)
@@ -178,8 +283,8 @@ def fetch_results(
 
             try:
 
-                with urllib.request.urlopen(url) as response:
-                    data = json.loads(response.read().decode())
+                with _urlopen(url) as response:
+                    data = _loads(response.read())
 
                     if "error" in data:
                         error_msg = data["error"].get(
@@ -227,7 +332,7 @@ def fetch_results(
                     raise APIRequestDailyLimitError() from e
                 error_msg = "Unknown error"
                 try:
-                    error_data = json.loads(e.read().decode())
+                    error_data = _loads(e.read())
                     error_msg = error_data.get("error", {}).get("message", error_msg)
                 except Exception:
                     logger.exception(error_msg)
@@ -250,16 +355,21 @@ def fetch_results(
 
 
 def _get_item_text(item: dict | list, field: str) -> Generator[str, None, None]:
-    if not isinstance(item, list):
-        item = [item]
-
-    next_field, *rest = field.split(".")
-
-    for obj in item:
-        if rest:
-            yield from _get_item_text(obj[next_field], ".".join(rest))
+    path = field.split(".")
+    last = len(path) - 1
+
+    # Walk depth first with an explicit stack of (value, depth) pairs
+    stack: list[tuple[dict | list, int]] = [(item, 0)]
+    while stack:
+        value, depth = stack.pop()
+        objs = value if isinstance(value, list) else [value]
+        key = path[depth]
+        if depth == last:
+            for obj in objs:
+                yield obj[key]
         else:
-            yield obj[next_field]
+            # Pushed in reverse so they are popped in order
+            stack.extend((obj[key], depth + 1) for obj in reversed(objs))
 
 
 def filter_results(
@@ -268,16 +378,16 @@ def filter_results(
     field: str,
 ) -> list[dict]:
     """Remove results that contain excluded terms in the field."""
-    if exclude_terms is None or not exclude_terms:
-        return list(results)
-
-    return [
-        r for r in results
-        if all(
-            all(
-                term.lower() not in " ".join(_get_item_text(r, field)).lower()
-                for term in terms
-            )
-            for terms in exclude_terms
-        )
-    ]
+    if not exclude_terms:
+        # Nothing to filter - avoid copying the page when it is already a list
+        return results if isinstance(results, list) else list(results)
+
+    lowered = [[term.lower() for term in terms] for terms in exclude_terms]
+
+    filtered = []
+    for r in results:
+        # Extract the text once per item and stop at the first excluded term
+        text = " ".join(_get_item_text(r, field)).lower()
+        if not any(term in text for terms in lowered for term in terms):
+            filtered.append(r)
+    return filtered
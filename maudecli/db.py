@@ -15,13 +15,22 @@ from __future__ import annotations
 
 # Python imports
 import asyncio
+import functools
 import hashlib
 import logging
+import multiprocessing
+import os
+import queue
 import sqlite3
+import threading
 import urllib.request
 import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from logging.handlers import QueueHandler
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 # Module imports
 import pandas as pd
@@ -30,6 +39,9 @@ from pandas.errors import EmptyDataError, ParserError
 # Local imports
 from maudecli.utils import compute_file_hash
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
 logger = logging.getLogger(__name__)
 
 # Global variables
@@ -64,8 +76,98 @@ DATAFILE_URLS = (
     "https://www.accessdata.fda.gov/MAUDE/ftparea/foitext2008.zip",
 )
 
-ALLOWED_RECORD_TYPES = ("device", "foitext", "foidev")
 RecordType = Literal["device", "foitext", "foidev"]
+ALLOWED_RECORD_TYPES: tuple[RecordType, ...] = ("device", "foitext", "foidev")
+
+# Maximum number of data files downloaded at once
+MAX_CONCURRENT_DOWNLOADS = 8
+# Rows passed to each executemany call when ingesting a file
+INSERT_BATCH_SIZE = 50_000
+# Worker processes used to parse and hash data files, capped to bound memory
+MAX_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Searchable fields used to route a query to the relevant table(s)
+FOITEXT_FIELDS = frozenset(("foi_text", "mdr_text_key", "text_type_code"))
+DEVICE_FIELDS = frozenset((
+    "brand_name",
+    "generic_name",
+    "manufacturer_d_name",
+    "model_number",
+    "device_report_product_code",
+))
+
+# FTS5 full-text indexes: index name -> (content table, indexed columns)
+FTS_TABLES: dict[str, tuple[RecordType, tuple[str, ...]]] = {
+    "foitext_fts": ("foitext", ("foi_text",)),
+    "device_fts": ("device", ("brand_name", "generic_name")),
+    "foidev_fts": ("foidev", ("brand_name", "generic_name")),
+}
+# Secondary indexes: index name -> (table, column, collation)
+INDEXES: dict[str, tuple[RecordType, str, str]] = {
+    "idx_foitext_mdr_report_key": ("foitext", "mdr_report_key", "BINARY"),
+}
+# Name indexes only created when SQLite cannot create the full-text indexes
+# (see ``create_fts_tables``). Otherwise name searches never read them, and
+# every bulk insert would still have to maintain them
+FTS_FALLBACK_INDEXES: dict[str, tuple[RecordType, str, str]] = {
+    "idx_device_brand_name": ("device", "brand_name", "NOCASE"),
+    "idx_device_generic_name": ("device", "generic_name", "NOCASE"),
+    "idx_foidev_brand_name": ("foidev", "brand_name", "NOCASE"),
+    "idx_foidev_generic_name": ("foidev", "generic_name", "NOCASE"),
+}
+# Candidates fetched per requested row before ranking limited FTS5 queries
+FTS_RANK_OVERSCAN = 10
+# Query shapes whose SQL (and prepared statement per connection) is cached
+STATEMENT_CACHE_SIZE = 512
+# Largest result limit whose query results are kept in ``_QUERY_CACHE``.
+# Unlimited queries can return millions of rows and are never cached
+CACHED_QUERY_MAX_LIMIT = 1000
+
+# Pooled read connections, keyed by database path. Each connection is stored
+# with the identity (see ``_db_identity``) of the file it was opened on
+_POOL: dict[Path, queue.Queue[tuple[sqlite3.Connection, tuple[int, ...]]]] = {}
+_POOL_LOCK = threading.Lock()
+_READ_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-131072",
+)
+# The build connection skips fsync: an interrupted build is safe because the
+# rollback journal is kept, only an OS crash mid-build could need a rebuild
+_BUILD_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+)
+
+
+def compute_row_hashes(df: pd.DataFrame) -> pd.Series:
+    """Compute hashes for every row of a frame to enable deduplication.
+
+    Each row is serialized as its values joined by ``|`` (missing values as
+    empty strings) and hashed with SHA256.
+
+    Args:
+        df: Pandas dataframe of rows to hash.
+
+    Returns:
+        Series of hexadecimal row hashes aligned with ``df``'s index.
+
+    """
+    # Replace missing values in one pass, then hash plain Python rows
+    rows = df.astype(object).where(df.notna(), "").to_numpy().tolist()
+    try:
+        # Ingested frames hold only strings, so skip the per-value str() call
+        joined = list(map("|".join, rows))
+    except TypeError:
+        joined = ["|".join(map(str, row)) for row in rows]
+
+    sha256 = hashlib.sha256
+    return pd.Series(
+        [sha256(line.encode()).hexdigest() for line in joined],
+        index=df.index,
+        dtype=object,
+    )
 
 
 def compute_row_hash(row: pd.Series) -> str:
@@ -78,9 +180,8 @@ def compute_row_hash(row: pd.Series) -> str:
         Hexadecimal string of the row hash.
 
     """
-    # Create a stable string representation of the row
-    row_str = "|".join(str(v) if pd.notna(v) else "" for v in row)
-    return hashlib.sha256(row_str.encode()).hexdigest()
+    return compute_row_hashes(row.to_frame().T).iloc[0]
+
 
 def classify_file(filename: str) -> RecordType | None:
     """Classify a file into its record type based on filename.
@@ -150,6 +251,109 @@ def create_tables(conn: sqlite3.Connection) -> None:
     conn.commit()
     logger.info("Database tables initialized")
 
+    create_fts_tables(conn)
+    create_indexes(conn)
+
+
+def create_indexes(
+    conn: sqlite3.Connection,
+    indexes: dict[str, tuple[RecordType, str, str]] = INDEXES,
+) -> None:
+    """Create secondary indexes on commonly searched columns.
+
+    Text columns are indexed with ``COLLATE NOCASE`` so case-insensitive
+    comparisons (including prefix ``LIKE`` patterns) can use the index.
+
+    Args:
+        conn: SQLite database connection.
+        indexes: Indexes to create, defaults to ``INDEXES``.
+
+    """
+    cursor = conn.cursor()
+
+    for index, (table, column, collation) in indexes.items():
+        # The indexed column must exist before it can be indexed
+        add_columns_if_needed(conn, table, [column])
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index}"
+            f" ON {table}({column} COLLATE {collation})",
+        )
+
+    conn.commit()
+
+
+def create_fts_tables(conn: sqlite3.Connection) -> None:
+    """Create the FTS5 full-text indexes if they don't exist.
+
+    Each index is an external-content FTS5 table kept in sync with its
+    content table by triggers, so text searches use the inverted index
+    instead of scanning every row with ``LIKE``. Rows already in the content
+    table are indexed when the FTS table is first created.
+
+    Args:
+        conn: SQLite database connection.
+
+    """
+    cursor = conn.cursor()
+
+    for fts_table, (table, columns) in FTS_TABLES.items():
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (fts_table,),
+        )
+        if cursor.fetchone() is not None:
+            continue
+
+        # The indexed columns must exist before the triggers reference them
+        add_columns_if_needed(conn, table, list(columns))
+
+        cols = ", ".join(columns)
+        new_cols = ", ".join(f"new.{col}" for col in columns)
+        old_cols = ", ".join(f"old.{col}" for col in columns)
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+                f"{cols}, content='{table}', content_rowid='rowid',"
+                " tokenize='porter unicode61', prefix='2 3 4')",
+            )
+        except sqlite3.OperationalError as e:
+            # SQLite builds without FTS5 fall back to LIKE searches, which
+            # can use NOCASE indexes for prefix patterns
+            logger.warning("Could not create full-text index %s: %s", fts_table, e)
+            create_indexes(conn, {
+                index: spec
+                for index, spec in FTS_FALLBACK_INDEXES.items()
+                if spec[0] == table and spec[1] in columns
+            })
+            continue
+
+        cursor.execute(f"""
+            CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts_table}(rowid, {cols})
+                VALUES (new.rowid, {new_cols});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {cols})
+                VALUES ('delete', old.rowid, {old_cols});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {cols})
+                VALUES ('delete', old.rowid, {old_cols});
+                INSERT INTO {fts_table}(rowid, {cols})
+                VALUES (new.rowid, {new_cols});
+            END
+        """)
+
+        # Index any rows ingested before the full-text index existed
+        cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        logger.info("Created full-text index %s on %s(%s)", fts_table, table, cols)
+
+    conn.commit()
+
 
 def is_file_ingested(
     conn: sqlite3.Connection, file_name: str, file_hash: str,
@@ -262,6 +466,23 @@ def ingest_file(
         record_type,
     )
 
+    df = _parse_file(file_path)  # noqa: PD901
+    if df is None:
+        return 0
+    return _insert_rows(conn, record_type, df, file_path.name)
+
+
+def _parse_file(file_path: Path) -> pd.DataFrame | None:
+    """Read a data file and compute its row hashes.
+
+    Kept at module level (and free of database access) so that it can be run
+    in a worker process by ``_parse_files``.
+
+    Returns:
+        The normalized rows with a ``row_hash`` column, or None if the file
+        could not be read or holds no data.
+
+    """
     # Determine if file is zipped
     if file_path.suffix.lower() == ".zip":
         with zipfile.ZipFile(file_path) as zf:
@@ -272,7 +493,7 @@ def ingest_file(
                     "Empty zip file: %s",
                     file_path.name,
                 )
-                return 0
+                return None
 
             with zf.open(names[0]) as f:
                 # Try to read with pipe delimiter
@@ -283,11 +504,11 @@ def ingest_file(
                         dtype=str,
                         encoding="latin1",
                         on_bad_lines="warn",
-                        engine="python",
+                        engine="c",
                     )
                 except (EmptyDataError, ParserError):
                     logger.exception("Error reading %s", file_path.name)
-                    return 0
+                    return None
     else:
         # Read CSV/TXT directly
         try:
@@ -297,15 +518,15 @@ def ingest_file(
                 dtype=str,
                 encoding="latin1",
                 on_bad_lines="warn",
-                engine="python",
+                engine="c",
             )
         except (EmptyDataError, ParserError):
             logger.exception("Error reading %s", file_path.name)
-            return 0
+            return None
 
     if df.empty:
         logger.warning("No data in %s", file_path.name)
-        return 0
+        return None
 
     # Normalize column names to lowercase and replace invalid characters
     df.columns = [
@@ -313,35 +534,118 @@ def ingest_file(
         for col in df.columns
     ]
 
+    # Compute row hashes
+    df["row_hash"] = compute_row_hashes(df)
+    return df
+
+
+def _parse_file_in_worker(
+    file_path: Path, level: int,
+) -> tuple[pd.DataFrame | None, list[logging.LogRecord]]:
+    """Run ``_parse_file`` in a worker process, capturing its log records.
+
+    Workers have no log handlers of their own, so the records at ``level``
+    and above are returned for the parent process to handle.
+    """
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = QueueHandler(records)
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    try:
+        df = _parse_file(file_path)  # noqa: PD901
+    finally:
+        logger.removeHandler(handler)
+
+    captured = []
+    while not records.empty():
+        captured.append(records.get())
+    return df, captured
+
+
+def _parse_files(
+    file_paths: Sequence[Path],
+) -> Iterator[pd.DataFrame | None]:
+    """Parse data files in worker processes, yielding results in order.
+
+    At most ``MAX_PARSE_WORKERS`` files are queued ahead of the consumer so
+    parsed frames do not pile up in memory while the single SQLite writer
+    catches up. Records logged by the workers are handled by this process's
+    logger as each result is yielded.
+    """
+    if len(file_paths) < 2 or MAX_PARSE_WORKERS < 2:  # noqa: PLR2004
+        for file_path in file_paths:
+            yield _parse_file(file_path)
+        return
+
+    # Spawn avoids forking a parent that holds an open SQLite connection
+    with ProcessPoolExecutor(
+        max_workers=MAX_PARSE_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        level = logger.getEffectiveLevel()
+        pending: deque[Future] = deque()
+        for file_path in file_paths:
+            pending.append(
+                executor.submit(_parse_file_in_worker, file_path, level),
+            )
+            if len(pending) > MAX_PARSE_WORKERS:
+                yield _collect(pending.popleft())
+        while pending:
+            yield _collect(pending.popleft())
+
+
+def _collect(future: Future) -> pd.DataFrame | None:
+    """Return a worker's parsed frame after handling its log records."""
+    df, records = future.result()  # noqa: PD901
+    for record in records:
+        logger.handle(record)
+    return df
+
+
+def _insert_rows(
+    conn: sqlite3.Connection,
+    record_type: RecordType,
+    df: pd.DataFrame,
+    file_name: str,
+) -> int:
+    """Insert parsed rows, skipping rows that already exist.
+
+    Returns:
+        Number of rows added.
+
+    """
     # Add columns to table if needed
     add_columns_if_needed(conn, record_type, df.columns.tolist())
 
-    # Compute row hashes
-    df["row_hash"] = df.apply(compute_row_hash, axis=1)
-
-    # Get existing row hashes to avoid duplicates
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT row_hash FROM {record_type}")
-    existing_hashes = {row[0] for row in cursor.fetchall()}
+    # Insert in batches within a single transaction, rows that already exist
+    # are skipped by the row_hash primary key
+    columns = df.columns.tolist()
+    sql = (
+        f"INSERT OR IGNORE INTO {record_type}"
+        f" ({', '.join(f'[{col}]' for col in columns)})"
+        f" VALUES ({', '.join('?' * len(columns))})"
+    )
+    rows = df.astype(object).where(df.notna(), None)
 
-    # Filter out rows that already exist
-    df_new = df[~df["row_hash"].isin(existing_hashes)]
+    rows_added = 0
+    with conn:
+        cursor = conn.cursor()
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            batch = rows.iloc[start:start + INSERT_BATCH_SIZE]
+            cursor.executemany(sql, batch.itertuples(index=False, name=None))
+            rows_added += cursor.rowcount
 
-    if df_new.empty:
+    if not rows_added:
         logger.info(
             "All rows from %s already exist in database",
-            file_path.name,
+            file_name,
         )
         return 0
 
-    # Insert new rows
-    df_new.to_sql(record_type, conn, if_exists="append", index=False)
-    rows_added = len(df_new)
-
     logger.info(
         "Ingested %s new rows from %s",
         rows_added,
-        file_path.name,
+        file_name,
     )
     return rows_added
 
@@ -380,11 +684,8 @@ async def download_file_from_url(url: str) -> Path:
     dest = CACHE_DIR / url.split("/")[-1]
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(
-        None,
-        lambda: urllib.request.urlretrieve(url, filename=dest),
-    )
+    # Blocking download in a worker thread so concurrent downloads overlap
+    await asyncio.to_thread(urllib.request.urlretrieve, url, filename=dest)
     return dest
 
 
@@ -398,10 +699,18 @@ async def build_database() -> None:
 
     # Connect to database
     conn = sqlite3.connect(DB_PATH)
+    for pragma in _BUILD_PRAGMAS:
+        conn.execute(pragma)
+
+    # Download data files concurrently, bounded to avoid FDA rate limiting
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+
+    async def _download(url: str) -> Path:
+        async with semaphore:
+            return await download_file_from_url(url)
 
-    # Download data files
     results = await asyncio.gather(
-        *[download_file_from_url(url) for url in DATAFILE_URLS],
+        *[_download(url) for url in DATAFILE_URLS],
         return_exceptions=True,
     )
 
@@ -438,31 +747,46 @@ async def build_database() -> None:
         files_skipped = 0
         files_errored = 0
 
+        pending: list[tuple[Path, RecordType, str]] = []
         for file_path in sorted(data_files):
-            try:
-                # Classify file
-                record_type = classify_file(file_path.name)
-                if record_type is None:
-                    logger.warning(
-                        "Could not classify file: %s", file_path.name,
-                    )
-                    files_skipped += 1
-                    continue
+            # Classify file
+            record_type = classify_file(file_path.name)
+            if record_type is None:
+                logger.warning(
+                    "Could not classify file: %s", file_path.name,
+                )
+                files_skipped += 1
+                continue
 
-                # Compute file hash
-                file_hash = compute_file_hash(file_path)
+            # Compute file hash
+            file_hash = compute_file_hash(file_path)
 
-                # Check if already ingested
-                if is_file_ingested(conn, file_path.name, file_hash):
-                    logger.info(
-                        "File already ingested (no changes): %s",
-                        file_path.name,
-                    )
-                    files_skipped += 1
-                    continue
+            # Check if already ingested
+            if is_file_ingested(conn, file_path.name, file_hash):
+                logger.info(
+                    "File already ingested (no changes): %s",
+                    file_path.name,
+                )
+                files_skipped += 1
+                continue
 
+            pending.append((file_path, record_type, file_hash))
+
+        # Parse files in parallel, the inserts stay on this single connection
+        parsed = _parse_files([file_path for file_path, _, _ in pending])
+        for (file_path, record_type, file_hash), df in zip(pending, parsed):
+            logger.info(
+                "Processing %s as %s",
+                file_path.name,
+                record_type,
+            )
+            try:
                 # Ingest file
-                rows_added = ingest_file(conn, file_path, record_type)
+                rows_added = (
+                    0
+                    if df is None
+                    else _insert_rows(conn, record_type, df, file_path.name)
+                )
 
                 # Log ingestion
                 log_ingestion(conn, file_path.name, file_hash, record_type, rows_added)
@@ -477,6 +801,14 @@ async def build_database() -> None:
                 files_errored += 1
                 # Continue with next file
 
+        if files_processed:
+            # Refresh the planner statistics so the indexes get used, sampling
+            # each index instead of reading it in full
+            conn.execute("PRAGMA analysis_limit=1000")
+            conn.execute("ANALYZE")
+            conn.commit()
+        conn.execute("PRAGMA optimize")
+
         # Print summary
         logger.info(
             "\n"
@@ -495,23 +827,199 @@ async def build_database() -> None:
 
         # Print table statistics
         cursor = conn.cursor()
-        for table in ["device", "foitext", "foidev"]:
+        for table in ALLOWED_RECORD_TYPES:
             cursor.execute(f"SELECT COUNT(*) FROM {table}")
             count = cursor.fetchone()[0]
             logger.info("Table '%s': %s rows", table, count)
 
     finally:
         conn.close()
+        # Cached query results may no longer reflect the database
+        _QUERY_CACHE.cache_clear()
 
     logger.info("Database build complete")
 
+def _connect_read(path: Path) -> sqlite3.Connection:
+    """Open a read-only connection to the database, tuned for repeated queries.
+
+    Memory-mapped I/O and a large page cache keep hot B-tree pages resident,
+    so repeated queries avoid a ``read()`` syscall per page. Opening with
+    ``mode=ro`` skips write locking and cannot create a missing database.
+    """
+    conn = sqlite3.connect(
+        f"{path.resolve().as_uri()}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _db_identity(path: Path) -> tuple[int, ...]:
+    """Return the identity of the database file currently at ``path``.
+
+    A rebuilt database replaces the file, so its device and inode change
+    even when the path does not. In-place writes change its size or
+    modification time.
+    """
+    st = path.stat()
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+@contextmanager
+def _checkout(
+    path: Path | None = None, identity: tuple[int, ...] | None = None,
+) -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled read connection to ``path`` (default ``DB_PATH``).
+
+    Pooled connections opened on a file that has since changed (``identity``,
+    default the file's current ``_db_identity``) are closed rather than
+    reused, they could keep reading the old file. The connection is returned
+    to the pool afterwards, or closed if the caller raised.
+    """
+    path = DB_PATH if path is None else path
+    identity = _db_identity(path) if identity is None else identity
+    with _POOL_LOCK:
+        pool = _POOL.setdefault(path, queue.Queue())
+
+    while True:
+        try:
+            conn, conn_identity = pool.get_nowait()
+        except queue.Empty:
+            conn = _connect_read(path)
+            break
+        if conn_identity == identity:
+            break
+        conn.close()
+
+    try:
+        yield conn
+    except BaseException:
+        conn.close()
+        raise
+    pool.put((conn, identity))
+
+
+def _reset_pool() -> None:
+    """Close all pooled connections, e.g. after ``DB_PATH`` is changed."""
+    with _POOL_LOCK:
+        pools = list(_POOL.values())
+        _POOL.clear()
+
+    for pool in pools:
+        while True:
+            try:
+                pool.get_nowait()[0].close()
+            except queue.Empty:
+                break
+
+
 def database_exists() -> bool:
     """Check if the local database exists.
 
     Returns:
         True if the database file exists, False otherwise.
     """
-    return DB_PATH.exists()
+    return DB_PATH.is_file()
+
+
+def _fts_table_for(
+    cursor: sqlite3.Cursor, table: str, search_field: str,
+) -> str | None:
+    """Return the FTS5 index covering ``table.search_field`` if it exists."""
+    for fts_table, (content_table, columns) in FTS_TABLES.items():
+        if content_table == table and search_field in columns:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (fts_table,),
+            )
+            if cursor.fetchone() is not None:
+                return fts_table
+    return None
+
+
+def _like_pattern(term: str) -> str:
+    """Return the ``LIKE`` pattern for a search term.
+
+    Used for fields without a full-text index, and for every field when
+    SQLite lacks FTS5 (``brand_name`` and ``generic_name`` are otherwise
+    searched through ``FTS_TABLES``, where ``*`` marks a word prefix). Terms
+    match anywhere in the field, except terms ending in ``*`` which only match
+    at the start. On the name columns those prefix patterns can be answered
+    from the ``COLLATE NOCASE`` indexes instead of scanning the table. ``%``
+    and ``_`` in the term are matched literally (the query uses
+    ``ESCAPE '\\'``).
+    """
+    escaped = (
+        term.rstrip("*")
+        .replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+    )
+    return f"{escaped}%" if term.endswith("*") else f"%{escaped}%"
+
+
+def _fts_match_expression(
+    search_terms: list[list[str]],
+    exclude_terms: list[list[str]] | None,
+    column: str,
+) -> str:
+    """Compose an FTS5 MATCH expression from term groups.
+
+    Terms are OR'd within a group and groups are AND'd together. Results
+    matching ALL exclude groups are removed with ``NOT``. Every term is
+    quoted so user input is never parsed as FTS5 query syntax.
+
+    Single-word terms are prefix queries (``"pace"*`` matches ``pacemaker``),
+    multi-word terms match the exact phrase unless they end in ``*``.
+    """
+    def _quote(term: str) -> str:
+        # The prefix marker must be outside the quotes
+        phrase = term.rstrip("*")
+        prefix = "*" if term != phrase or not any(
+            c.isspace() for c in phrase.strip()
+        ) else ""
+        return '"' + phrase.replace('"', '""') + '"' + prefix
+
+    def _groups(groups: list[list[str]]) -> str:
+        return " AND ".join(
+            "(" + " OR ".join(_quote(term) for term in group) + ")"
+            for group in groups
+            if group
+        )
+
+    expression = _groups(search_terms)
+    if exclude_terms and (excluded := _groups(exclude_terms)):
+        expression = f"({expression}) NOT ({excluded})"
+    return f"{{{column}}} : ({expression})"
+
+
+def _fts_ranked_query(
+    table: str, fts_table: str, columns: Sequence[str] | None = None,
+) -> str:
+    """Return the SQL for a relevance-ranked, limited full-text query.
+
+    Ranking with ``ORDER BY rank`` over the whole MATCH forces FTS5 to score
+    every matching row. Instead a bounded candidate set is taken first and
+    only those rows are ordered by ``bm25``. Parameters are the MATCH
+    expression, the candidate limit and the result limit.
+    """
+    select = (
+        ", ".join(f"{table}.[{col}]" for col in columns)
+        if columns
+        else f"{table}.*"
+    )
+    return (
+        f"WITH cand AS ("
+        f"SELECT rowid, bm25({fts_table}) AS score FROM {fts_table}"
+        f" WHERE {fts_table} MATCH ? LIMIT ?"
+        f") SELECT {select} FROM {table}"
+        f" JOIN cand ON {table}.rowid = cand.rowid"
+        f" ORDER BY cand.score LIMIT ?"
+    )
 
 
 def query_local_database(
@@ -519,6 +1027,7 @@ def query_local_database(
     exclude_terms: list[list[str]] | None = None,
     search_field: str = "foi_text",
     limit: int | None = None,
+    columns: Sequence[str] | None = None,
 ) -> list[dict[str, Any]]:
     """Query the local historical MAUDE database.
     
@@ -531,98 +1040,216 @@ def query_local_database(
             For device tables, common fields include 'brand_name', 'generic_name'.
             Default is 'foi_text'.
         limit: Maximum number of results to return. None for no limit.
+        columns: Columns to return. ``row_hash`` and ``search_field`` are
+            always included and columns missing from a table are skipped.
+            None (default) returns every column.
         
     Returns:
         List of dictionaries containing the query results.
+
+    Note:
+        Results of queries with a ``limit`` of at most
+        ``CACHED_QUERY_MAX_LIMIT`` are cached per database path, file identity
+        (device, inode, size and modification time) and normalized query, so
+        repeating an equivalent query does not touch the database until the
+        file changes or is replaced. The cache is also cleared whenever
+        ``build_database`` runs. Other queries are not cached, so their
+        results are not held in memory after they are returned.
     """
     if not database_exists():
         logger.warning(f"Local database not found at {DB_PATH}")
         return []
-    
+
+    cached = limit is not None and limit <= CACHED_QUERY_MAX_LIMIT
+    try:
+        results = (_QUERY_CACHE if cached else _query_impl)(
+            DB_PATH,
+            _db_identity(DB_PATH),
+            _canonical_term_groups(search_terms),
+            _canonical_term_groups(exclude_terms),
+            search_field,
+            limit,
+            tuple(columns) if columns is not None else None,
+        )
+    except Exception as e:
+        logger.error(f"Error querying local database: {e}", exc_info=True)
+        return []
+
+    logger.info(f"Local database query returned {len(results)} results")
+    if cached:
+        # Copy the rows so callers cannot modify the cached results
+        return [dict(r) for r in results]
+    return list(results)
+
+
+def _canonical_term_groups(
+    groups: list[list[str]] | None,
+) -> frozenset[frozenset[str]]:
+    """Normalize term groups into a hashable, order-independent cache key.
+
+    Matching is case-insensitive, so terms are lowercased.
+    """
+    return frozenset(
+        frozenset(term.lower() for term in group) for group in groups or ()
+    )
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _query_sql(
+    table: str,
+    search_field: str,
+    group_sizes: tuple[int, ...],
+    fts_table: str | None,
+    has_limit: bool,
+    selected: tuple[str, ...] | None,
+) -> str:
+    """Return the parameterized SELECT for a query shape.
+
+    The statement only depends on the shape of the query, not the term values,
+    so it is built once per shape and memoized. Reusing the exact same SQL
+    text also lets each pooled connection's statement cache skip re-preparing
+    it.
+    """
+    if fts_table and has_limit:
+        query = _fts_ranked_query(table, fts_table, selected)
+    else:
+        if fts_table:
+            # Full-text index lookup
+            where_clauses = [
+                f"rowid IN (SELECT rowid FROM {fts_table}"
+                f" WHERE {fts_table} MATCH ?)",
+            ]
+        else:
+            # Each group is OR'd internally, groups are AND'd together
+            where_clauses = [
+                "(" + " OR ".join(
+                    [f"{search_field} LIKE ? ESCAPE '\\'"] * size,
+                ) + ")"
+                for size in group_sizes
+                if size
+            ]
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+
+        select = ", ".join(f"[{col}]" for col in selected) if selected else "*"
+        query = f"SELECT {select} FROM {table} WHERE {where_sql}"
+        if has_limit:
+            query += " LIMIT ?"
+
+    return query
+
+
+def _query_impl(
+    db_path: Path,
+    db_identity: tuple[int, ...],
+    search_groups: frozenset[frozenset[str]],
+    exclude_groups: frozenset[frozenset[str]],
+    search_field: str,
+    limit: int | None,
+    columns: tuple[str, ...] | None,
+) -> tuple[dict[str, Any], ...]:
+    """Run a local database query for canonicalized term groups.
+
+    ``db_identity`` keys ``_QUERY_CACHE`` so that results are not served from
+    before the database last changed. The query runs on a connection to that
+    same file identity, so stale rows are never cached under a new key.
+    """
+    search_terms = sorted(sorted(group) for group in search_groups)
+    exclude_terms = sorted(sorted(group) for group in exclude_groups)
+    # Exclusions filtered in Python match anywhere, prefix markers are dropped
+    substring_excludes = [
+        [term.rstrip("*") for term in group] for group in exclude_terms
+    ]
+
     # Determine which table(s) to query based on search field
-    tables = []
-    if search_field in ["foi_text", "mdr_text_key", "text_type_code"]:
-        tables.append("foitext")
-    elif search_field in ["brand_name", "generic_name", "manufacturer_d_name", 
-                          "model_number", "device_report_product_code"]:
-        tables.extend(["device", "foidev"])
+    tables: tuple[RecordType, ...]
+    if search_field in FOITEXT_FIELDS:
+        tables = ("foitext",)
+    elif search_field in DEVICE_FIELDS:
+        tables = ("device", "foidev")
     else:
         # Default: search all tables
-        tables.extend(["device", "foitext", "foidev"])
+        tables = ALLOWED_RECORD_TYPES
     
     results = []
-    
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+
+    with _checkout(db_path, db_identity) as conn:
         cursor = conn.cursor()
-        
+
         for table in tables:
             # Check if the field exists in this table
             cursor.execute(f"PRAGMA table_info({table})")
-            columns = {row[1] for row in cursor.fetchall()}
-            
-            if search_field not in columns:
+            table_columns = {row[1] for row in cursor.fetchall()}
+
+            if search_field not in table_columns:
                 logger.debug(f"Field '{search_field}' not in table '{table}', skipping")
                 continue
-            
-            # Build WHERE clause for search terms
-            # Each group is OR'd internally, groups are AND'd together
-            where_clauses = []
-            params = []
-            
-            for group in search_terms:
-                group_conditions = []
-                for term in group:
-                    group_conditions.append(f"{search_field} LIKE ?")
-                    params.append(f"%{term}%")
-                if group_conditions:
-                    where_clauses.append(f"({' OR '.join(group_conditions)})")
-            
-            where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-            
-            # Build query
-            query = f"SELECT * FROM {table} WHERE {where_sql}"
+
+            # Only fetch the requested columns that exist in this table
+            selected = (
+                [
+                    col for col in dict.fromkeys(
+                        ("row_hash", search_field, *columns),
+                    )
+                    if col in table_columns
+                ]
+                if columns is not None
+                else None
+            )
+
+            fts_table = (
+                _fts_table_for(cursor, table, search_field)
+                if any(search_terms)
+                else None
+            )
+            if fts_table:
+                # Exclusions are applied by the MATCH expression
+                params: list[Any] = [
+                    _fts_match_expression(search_terms, exclude_terms, search_field),
+                ]
+                if limit:
+                    params.append(limit * FTS_RANK_OVERSCAN)
+            else:
+                params = [
+                    _like_pattern(term) for group in search_terms for term in group
+                ]
             if limit:
-                query += f" LIMIT {limit}"
-            
+                params.append(limit)
+
+            query = _query_sql(
+                table,
+                search_field,
+                tuple(len(group) for group in search_terms),
+                fts_table,
+                bool(limit),
+                tuple(selected) if selected is not None else None,
+            )
+
             logger.debug(f"Executing query on {table}: {query}")
             cursor.execute(query, params)
-            
+
             # Fetch results and convert to dicts
             for row in cursor.fetchall():
                 result_dict = dict(row)
-                
+
                 # Apply exclusion filtering in Python (simpler than complex SQL)
-                if exclude_terms:
-                    should_exclude = True
-                    for exclude_group in exclude_terms:
-                        # Check if ANY term in this group matches
-                        group_matches = False
-                        for term in exclude_group:
-                            field_value = str(result_dict.get(search_field, "")).lower()
-                            if term.lower() in field_value:
-                                group_matches = True
-                                break
-                        # If this group doesn't match, don't exclude
-                        if not group_matches:
-                            should_exclude = False
-                            break
-                    
-                    if should_exclude:
+                if exclude_terms and not fts_table:
+                    # Terms are already lowercased, so lower the value once
+                    field_value = str(result_dict.get(search_field, "")).lower()
+                    # Exclude only if ANY term matches in EVERY group
+                    if all(
+                        any(term in field_value for term in exclude_group)
+                        for exclude_group in substring_excludes
+                    ):
                         continue
-                
+
                 # Add table source for debugging
                 result_dict["_source"] = f"local_db:{table}"
                 results.append(result_dict)
-        
-        conn.close()
-        
-    except Exception as e:
-        logger.error(f"Error querying local database: {e}", exc_info=True)
-    
-    logger.info(f"Local database query returned {len(results)} results")
-    return results
+
+    return tuple(results)
+
+
+_QUERY_CACHE = functools.lru_cache(maxsize=256)(_query_impl)
 
 
 def get_table_stats() -> dict[str, int]:
@@ -634,12 +1261,12 @@ def get_table_stats() -> dict[str, int]:
     if not database_exists():
         return {}
 
-    stats = {}
+    stats: dict[str, int] = {}
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with _checkout() as conn:
             cursor = conn.cursor()
 
-            for table in ["device", "foitext", "foidev"]:
+            for table in ALLOWED_RECORD_TYPES:
                 cursor.execute(f"SELECT COUNT(*) FROM {table}")
                 count = cursor.fetchone()[0]
                 stats[table] = count
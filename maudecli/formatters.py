@@ -4,48 +4,64 @@ from __future__ import annotations
 
 # Python imports
 import csv
+import functools
 import logging
-import re
 from collections.abc import Sequence
 from io import StringIO
-from typing import Any
+from typing import Any, TextIO
 
 logger = logging.getLogger(__name__)
 
+# Property drawer delimiters written around every result
+_PROPERTIES_OPEN = "\n:PROPERTIES:"
+_PROPERTIES_CLOSE = "\n:END:\n"
 
-def _format(
-    k: str, v: str | dict[str, Any] | list[str], root: str = "",
-) -> str:
-    logger.debug(
-        "Formatting %s with root %s and value %s (type=%s)",
-        k,
-        root,
-        v,
-        type(v),
-    )
-    _root = f"{root}_{k.upper()}" if root else k.upper()
-    if isinstance(v, str):
-        return f"\n:{_root}: {v}"
-
-    # Explicitly check types instead of using try/except
-    if isinstance(v, dict):
-        return "".join(
-            _format(_k, _v, root=_root)
-            for _k, _v in v.items()
-        )
 
-    if isinstance(v, Sequence):
-        return "".join(
-            _format(k, item, root=root + f"_{i}" if i else root)
-            for i, item in enumerate(v)
-        )
+@functools.lru_cache(maxsize=1024)
+def _property_name(k: str) -> str:
+    """Upper-case a key for use in a property name (cached per key)."""
+    return k.upper()
 
-    msg = f"Unsupported type: {type(v)}"
-    logger.critical(
-        "%s. Supported types are str, dict and Sequence",
-        msg,
-    )
-    raise TypeError(msg)
+
+def _flatten(
+    k: str, v: str | dict[str, Any] | list[str], root: str, out: list[str],
+) -> None:
+    """Append the property lines for ``k`` to ``out``, depth first.
+
+    Nested values are walked with an explicit stack rather than recursion.
+    """
+    stack = [(k, v, root)]
+    while stack:
+        k, v, root = stack.pop()
+        logger.debug(
+            "Formatting %s with root %s and value %s (type=%s)",
+            k,
+            root,
+            v,
+            type(v),
+        )
+        _root = f"{root}_{_property_name(k)}" if root else _property_name(k)
+        if isinstance(v, str):
+            out.append(f"\n:{_root}: {v}")
+
+        # Explicitly check types instead of using try/except
+        elif isinstance(v, dict):
+            # Pushed in reverse so they are popped in order
+            stack.extend((_k, _v, _root) for _k, _v in reversed(v.items()))
+
+        elif isinstance(v, Sequence):
+            stack.extend(
+                (k, v[i], root + f"_{i}" if i else root)
+                for i in reversed(range(len(v)))
+            )
+
+        else:
+            msg = f"Unsupported type: {type(v)}"
+            logger.critical(
+                "%s. Supported types are str, dict and Sequence",
+                msg,
+            )
+            raise TypeError(msg)
 
 
 def as_org(
@@ -69,27 +85,48 @@ def as_org(
     out : Formatted org-mode to-do list.
 
   """
-  out = ""
+  # Build the per-call constants once rather than for every result
+  heading = "*" * level + " TODO "
+  wanted = None if fields is None else frozenset(fields)
+
+  out: list[str] = []
   for r in results:
     name_str = r[name]
-    out += "*" * level + " TODO " + name_str + "\n:PROPERTIES:"
+    out.append(heading + name_str + _PROPERTIES_OPEN)
     for k, v in r.items():
-        if k != name and (fields is None or k in fields):
-            out += _format(k, v)
-    out += "\n:END:\n"
-  return out
+        if k != name and (wanted is None or k in wanted):
+            _flatten(k, v, "", out)
+    out.append(_PROPERTIES_CLOSE)
+  return "".join(out)
 
 
-def as_csv(results: list[dict], fields: list | None = None) -> str:
+class _CarriageReturnFilter:
+    """Text stream wrapper that drops carriage returns from written text."""
+
+    def __init__(self, sink: TextIO) -> None:
+        self._write = sink.write
+
+    def write(self, s: str) -> int:
+        return self._write(s.replace("\r", ""))
+
+
+def as_csv(
+    results: list[dict],
+    fields: list | None = None,
+    sink: TextIO | None = None,
+) -> str:
     """Format the response as CSV.
 
     Args:
         results: A list of results dictionaries from the JSON API output.
         fields: A subset of fields to include. If None (default) then will
             include all fields found in the first result.
+        sink: A writable text stream. If given, rows are written to it as they
+            are formatted instead of being collected into a string.
+            Defaults to None.
 
     Returns:
-        out: Formatted CSV string.
+        out: Formatted CSV string, or an empty string if ``sink`` is given.
 
     """
     if not results:
@@ -104,14 +141,17 @@ def as_csv(results: list[dict], fields: list | None = None) -> str:
     else:
         headers = fields
 
-    # Create CSV in memory
+    # Create CSV in memory unless streaming to the caller's sink
     output = StringIO()
-    writer = csv.DictWriter(output, fieldnames=headers)
+    writer = csv.writer(
+        output if sink is None else _CarriageReturnFilter(sink),
+        lineterminator="\n",
+    )
 
-    writer.writeheader()
-    for r in results:
-        # Filter to only include specified fields
-        row = {k: v for k, v in r.items() if k in headers}
-        writer.writerow(row)
+    writer.writerow(headers)
+    # Look up only the header fields, missing fields are written as empty
+    writer.writerows([r.get(k) for k in headers] for r in results)
 
-    return re.sub("\r", "", output.getvalue())
+    if sink is not None:
+        return ""
+    return output.getvalue().replace("\r", "")
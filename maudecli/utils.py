@@ -15,10 +15,7 @@ def compute_file_hash(file_path: Path) -> str:
         Hexadecimal string of the file hash.
 
     """
-    sha256 = hashlib.sha256()
     with file_path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
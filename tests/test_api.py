@@ -9,9 +9,13 @@ validation, results filtering, and API integration.
 
 from __future__ import annotations
 
+import http.client
 import json
+import shutil
+import tempfile
 import unittest
 import urllib
+from pathlib import Path
 from typing import Any
 from unittest import mock
 
@@ -140,6 +144,33 @@ class TestSearchTermValidation(unittest.TestCase):
             api._validate_search_terms([(NoString(),)])
 
 
+class TestSearchTermCanonicalization(unittest.TestCase):
+    """Test suite for search term canonicalization.
+
+    Verifies that equivalent term groups are normalized to a single,
+    stable representation before the request URL is built.
+    """
+
+    def test_order_independent(self) -> None:
+        """Test that term and group order do not affect the result."""
+        self.assertEqual(
+            api._canonicalize_search_terms([["pacemaker"], ["mri", "magnet"]]),
+            api._canonicalize_search_terms([["magnet", "mri"], ["pacemaker"]]),
+        )
+
+    def test_whitespace_and_duplicates(self) -> None:
+        """Test that whitespace, blank and duplicate terms are removed."""
+        result: list[list[str]] = api._canonicalize_search_terms(
+            [[" mri", "mri ", ""], ["mri"], ["  "]],
+        )
+        self.assertEqual(result, [["mri"]])
+
+    def test_case_preserved(self) -> None:
+        """Test that case is preserved for case-sensitive exact fields."""
+        result: list[list[str]] = api._canonicalize_search_terms([["MRI"]])
+        self.assertEqual(result, [["MRI"]])
+
+
 class TestResultsFiltering(unittest.TestCase):
     """Test suite for results filtering functionality.
 
@@ -270,6 +301,20 @@ class TestItemTextExtraction(unittest.TestCase):
         result: list[str] = list(api._get_item_text(item, "reports.details.text"))
         self.assertEqual(result, ["Deeply nested text"])
 
+    def test_nested_list_extraction_order(self) -> None:
+        """Test extracting text through lists at several levels.
+
+        Verifies values are yielded in document order.
+        """
+        item: dict[str, Any] = {
+            "reports": [
+                {"details": [{"text": "First"}, {"text": "Second"}]},
+                {"details": {"text": "Third"}},
+            ],
+        }
+        result: list[str] = list(api._get_item_text(item, "reports.details.text"))
+        self.assertEqual(result, ["First", "Second", "Third"])
+
 
 class TestAPIIntegration(unittest.TestCase):
     """Test suite for API integration functionality.
@@ -278,7 +323,7 @@ class TestAPIIntegration(unittest.TestCase):
     the API, processes responses, and applies filtering logic.
     """
 
-    @mock.patch("urllib.request.urlopen")
+    @mock.patch("maudecli.api._urlopen")
     def test_fetch_results(
         self,
         mock_urlopen: mock.MagicMock,
@@ -288,7 +333,7 @@ class TestAPIIntegration(unittest.TestCase):
         Verifies that results are correctly retrieved and parsed from API response.
 
         Args:
-            mock_urlopen: Mocked urllib.request.urlopen function
+            mock_urlopen: Mocked maudecli.api._urlopen function
 
         """
         # Mock API response
@@ -312,7 +357,35 @@ class TestAPIIntegration(unittest.TestCase):
         self.assertEqual(results[0]["report_number"], "R123")
         self.assertEqual(results[0]["mdr_text"]["text"], "MRI report")
 
-    @mock.patch("urllib.request.urlopen")
+    @mock.patch("maudecli.api.get_api_key", return_value=None)
+    @mock.patch("maudecli.api._urlopen")
+    def test_preserve_order_sends_terms_unchanged(
+        self,
+        mock_urlopen: mock.MagicMock,
+        _mock_get_api_key: mock.MagicMock,
+    ) -> None:
+        """Test that preserve_order=True skips term canonicalization.
+
+        Args:
+            mock_urlopen: Mocked maudecli.api._urlopen function
+            _mock_get_api_key: Mocked maudecli.api.get_api_key function
+
+        """
+        mock_response = mock.Mock()
+        mock_response.getheader.return_value = None
+        mock_response.read.return_value = json.dumps(
+            {"meta": {}, "results": []},
+        ).encode("utf-8")
+        mock_urlopen.return_value.__enter__.return_value = mock_response
+
+        api.fetch_results(["mri", "magnet"], ["pacemaker"], preserve_order=True)
+        api.fetch_results(["mri", "magnet"], ["pacemaker"])
+
+        preserved, canonical = (c.args[0] for c in mock_urlopen.call_args_list)
+        self.assertIn(":(mri+OR+magnet)+AND+(pacemaker)&", preserved)
+        self.assertIn(":(magnet+OR+mri)+AND+(pacemaker)&", canonical)
+
+    @mock.patch("maudecli.api._urlopen")
     def test_fetch_results_with_exclusion(
         self,
         mock_urlopen: mock.MagicMock,
@@ -322,7 +395,7 @@ class TestAPIIntegration(unittest.TestCase):
         Verifies that exclusion terms are properly applied during result fetching.
 
         Args:
-            mock_urlopen: Mocked urllib.request.urlopen function
+            mock_urlopen: Mocked maudecli.api._urlopen function
 
         """
         # Mock API response
@@ -357,7 +430,7 @@ class TestAPIIntegration(unittest.TestCase):
 class TestAPIErrorHandling(unittest.TestCase):
     """Test suite for API error handling functionality."""
 
-    @mock.patch("urllib.request.urlopen")
+    @mock.patch("maudecli.api._urlopen")
     def test_rate_limit_error(
         self,
         mock_urlopen: mock.MagicMock,
@@ -376,7 +449,7 @@ class TestAPIErrorHandling(unittest.TestCase):
             api.fetch_results(["test"])
 
 
-    @mock.patch("urllib.request.urlopen")
+    @mock.patch("maudecli.api._urlopen")
     def test_api_error_response(
         self,
         mock_urlopen: mock.MagicMock,
@@ -400,7 +473,7 @@ class TestAPIErrorHandling(unittest.TestCase):
         )
 
 
-    @mock.patch("urllib.request.urlopen")
+    @mock.patch("maudecli.api._urlopen")
     def test_network_error(
         self,
         mock_urlopen: mock.MagicMock,
@@ -416,7 +489,7 @@ class TestAPIErrorHandling(unittest.TestCase):
             str(context.exception), "Failed to connect to API: Connection refused",
         )
 
-    @mock.patch("urllib.request.urlopen")
+    @mock.patch("maudecli.api._urlopen")
     def test_invalid_json_response(
         self,
         mock_urlopen: mock.MagicMock,
@@ -433,5 +506,146 @@ class TestAPIErrorHandling(unittest.TestCase):
         self.assertIn("Invalid JSON response", str(context.exception))
 
 
+class TestAPIKeyStorage(unittest.TestCase):
+    """Test suite for saving and loading the API key."""
+
+    def setUp(self) -> None:
+        """Point the configuration file at a temporary directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        patcher = mock.patch.object(
+            api, "_CONFIG_PATH", self.temp_dir / ".maudecli" / "config.ini",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+
+    def test_set_api_key_round_trip(self) -> None:
+        """Test that a saved key is read back and replaces the old one.
+
+        Verifies the file is private and no temporary file is left behind.
+        """
+        api.set_api_key("first")
+        api.set_api_key("second")
+
+        self.assertEqual(api.get_api_key(), "second")
+        self.assertEqual(api._CONFIG_PATH.stat().st_mode & 0o777, 0o600)
+        self.assertEqual(
+            [p.name for p in api._CONFIG_PATH.parent.iterdir()], ["config.ini"],
+        )
+
+
+class TestKeepAliveConnection(unittest.TestCase):
+    """Test suite for the persistent connection used by fetch_results."""
+
+    def setUp(self) -> None:
+        """Start each test without any cached connections."""
+        api._CONNECTIONS.clear()
+        self.addCleanup(api._CONNECTIONS.clear)
+        patcher = mock.patch("urllib.request.getproxies", return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("http.client.HTTPSConnection")
+    def test_connection_reused_across_requests(
+        self,
+        mock_connection: mock.MagicMock,
+    ) -> None:
+        """Test that requests to the same host share one connection."""
+        mock_connection.return_value.getresponse.return_value.status = 200
+
+        api._urlopen("https://api.fda.gov/device/event.json?search=a")
+        api._urlopen("https://api.fda.gov/device/event.json?search=b")
+
+        mock_connection.assert_called_once_with(
+            "api.fda.gov", timeout=api._TIMEOUT,
+        )
+        self.assertEqual(mock_connection.return_value.request.call_count, 2)
+
+    @mock.patch("http.client.HTTPSConnection")
+    def test_error_status_raises_http_error(
+        self,
+        mock_connection: mock.MagicMock,
+    ) -> None:
+        """Test that error statuses surface as urllib HTTPError."""
+        response = mock_connection.return_value.getresponse.return_value
+        response.status = 429
+        response.reason = "Too Many Requests"
+        response.headers = {"X-RateLimit-Reset": None}
+        response.read.return_value = b"{}"
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            api._urlopen("https://api.fda.gov/device/event.json?search=a")
+
+        self.assertEqual(context.exception.code, 429)
+
+    @mock.patch("http.client.HTTPSConnection")
+    def test_redirect_is_followed(
+        self,
+        mock_connection: mock.MagicMock,
+    ) -> None:
+        """Test that a redirect is followed to its Location."""
+        redirect = mock.Mock(status=301, reason="Moved Permanently")
+        redirect.getheader.return_value = "/device/event.json?search=b"
+        redirect.read.return_value = b""
+        final = mock.Mock(status=200)
+        mock_connection.return_value.getresponse.side_effect = [redirect, final]
+
+        response = api._urlopen("https://api.fda.gov/other.json?search=a")
+
+        self.assertIs(response, final)
+        mock_connection.return_value.request.assert_called_with(
+            "GET",
+            "/device/event.json?search=b",
+            headers={"User-Agent": "maude-cli"},
+        )
+
+    @mock.patch("http.client.HTTPSConnection")
+    def test_redirect_without_location_raises_http_error(
+        self,
+        mock_connection: mock.MagicMock,
+    ) -> None:
+        """Test that an unfollowable redirect is not returned as success."""
+        response = mock_connection.return_value.getresponse.return_value
+        response.status = 304
+        response.reason = "Not Modified"
+        response.headers = {}
+        response.getheader.return_value = None
+        response.read.return_value = b""
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            api._urlopen("https://api.fda.gov/device/event.json?search=a")
+
+        self.assertEqual(context.exception.code, 304)
+
+    @mock.patch("http.client.HTTPSConnection")
+    def test_timeout_is_retried_then_raised(
+        self,
+        mock_connection: mock.MagicMock,
+    ) -> None:
+        """Test that a connection that stops responding does not hang."""
+        mock_connection.return_value.getresponse.side_effect = TimeoutError()
+
+        with self.assertRaises(urllib.error.URLError):
+            api._urlopen("https://api.fda.gov/device/event.json?search=a")
+
+        self.assertEqual(mock_connection.call_count, 2)
+
+    @mock.patch("http.client.HTTPSConnection")
+    def test_dropped_connection_is_retried(
+        self,
+        mock_connection: mock.MagicMock,
+    ) -> None:
+        """Test that a stale keep-alive connection is replaced once."""
+        mock_connection.return_value.request.side_effect = [
+            http.client.RemoteDisconnected("closed"),
+            None,
+        ]
+        mock_connection.return_value.getresponse.return_value.status = 200
+
+        api._urlopen("https://api.fda.gov/device/event.json?search=a")
+
+        self.assertEqual(mock_connection.call_count, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
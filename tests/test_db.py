@@ -1,12 +1,13 @@
 """Unit tests for local database functionality."""
 
 import asyncio
-import gc
+import os
 import shutil
 import sqlite3
 import tempfile
 import unittest
 import zipfile
+from contextlib import closing
 from pathlib import Path
 from unittest.mock import patch
 
@@ -14,74 +15,76 @@ from maudecli import db
 from maudecli.db import classify_file, compute_file_hash, compute_row_hash
 
 
+# Sample rows for the query tests
+FOI_ROWS = (
+    ('hash1', 'R001', 'MRI scan revealed artifact'),
+    ('hash2', 'R002', 'Patient received pacemaker'),
+    ('hash3', 'R003', 'MRI compatible pacemaker installed'),
+    ('hash4', 'R004', 'Device malfunction during procedure'),
+)
+DEVICE_ROWS = (
+    ('hash5', 'Brand A MRI Scanner', 'MRI Device'),
+    ('hash6', 'Brand B Pacemaker', 'Cardiac Pacemaker'),
+)
+
+
 class TestDatabaseQueries(unittest.TestCase):
     """Test suite for database query functionality."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the in-memory template database shared by every test."""
+        cls.template_conn = conn = sqlite3.connect(':memory:')
+
+        # Create tables and insert test data in one transaction
+        with conn:
+            conn.execute("""
+                CREATE TABLE foitext (
+                    row_hash TEXT PRIMARY KEY,
+                    mdr_report_key TEXT,
+                    foi_text TEXT
+                )
+            """)
+            for table in ('device', 'foidev'):
+                conn.execute(f"""
+                    CREATE TABLE {table} (
+                        row_hash TEXT PRIMARY KEY,
+                        brand_name TEXT,
+                        generic_name TEXT
+                    )
+                """)
+
+            conn.executemany("INSERT INTO foitext VALUES (?, ?, ?)", FOI_ROWS)
+            conn.executemany("INSERT INTO device VALUES (?, ?, ?)", DEVICE_ROWS)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Close the template database."""
+        cls.template_conn.close()
+
     def setUp(self):
         """Set up test database."""
         # Create a temporary database for testing
         self.temp_db = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.db')
         self.temp_db_path = Path(self.temp_db.name)
         self.temp_db.close()
-        
+
+        # Copy the template's pages rather than rebuilding it for every test
+        with closing(sqlite3.connect(self.temp_db_path)) as dest:
+            self.template_conn.backup(dest)
+
         # Patch DB_PATH to use temp database
         self.original_db_path = db.DB_PATH
         db.DB_PATH = self.temp_db_path
-        
-        # Create test database with sample data
-        conn = sqlite3.connect(self.temp_db_path)
-        cursor = conn.cursor()
-        
-        # Create tables
-        cursor.execute("""
-            CREATE TABLE foitext (
-                row_hash TEXT PRIMARY KEY,
-                mdr_report_key TEXT,
-                foi_text TEXT
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE device (
-                row_hash TEXT PRIMARY KEY,
-                brand_name TEXT,
-                generic_name TEXT
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE foidev (
-                row_hash TEXT PRIMARY KEY,
-                brand_name TEXT,
-                generic_name TEXT
-            )
-        """)
-        
-        # Insert test data
-        cursor.execute("""
-            INSERT INTO foitext VALUES 
-            ('hash1', 'R001', 'MRI scan revealed artifact'),
-            ('hash2', 'R002', 'Patient received pacemaker'),
-            ('hash3', 'R003', 'MRI compatible pacemaker installed'),
-            ('hash4', 'R004', 'Device malfunction during procedure')
-        """)
-        
-        cursor.execute("""
-            INSERT INTO device VALUES
-            ('hash5', 'Brand A MRI Scanner', 'MRI Device'),
-            ('hash6', 'Brand B Pacemaker', 'Cardiac Pacemaker')
-        """)
-        
-        conn.commit()
-        conn.close()
-    
+        db._reset_pool()
+        db._QUERY_CACHE.cache_clear()
+
     def tearDown(self):
         """Clean up test database."""
+        db._reset_pool()
+        db._QUERY_CACHE.cache_clear()
         db.DB_PATH = self.original_db_path
 
-        # Force garbage collection
-        gc.collect()
-
         self.temp_db_path.unlink(missing_ok=True)
 
     def test_database_exists(self):
@@ -193,6 +196,302 @@ class TestDatabaseQueries(unittest.TestCase):
         # Should return all records (up to limit)
         self.assertGreater(len(results), 0)
 
+    def test_column_projection(self):
+        """Test that only the requested columns are returned."""
+        results = db.query_local_database(
+            [['MRI']],
+            search_field='foi_text',
+            columns=['mdr_report_key', 'missing_column'],
+        )
+        self.assertEqual(len(results), 2)
+        for r in results:
+            self.assertEqual(
+                set(r), {'row_hash', 'foi_text', 'mdr_report_key', '_source'},
+            )
+
+    def test_connection_is_reused(self):
+        """Test that repeated queries reuse the pooled read connection."""
+        db.query_local_database([['MRI']], search_field='foi_text')
+
+        with patch('maudecli.db.sqlite3.connect') as mock_connect:
+            results = db.query_local_database(
+                [['pacemaker']], search_field='foi_text',
+            )
+
+        mock_connect.assert_not_called()
+        self.assertEqual(len(results), 2)
+
+    def test_pooled_connection_not_reused_after_file_replaced(self):
+        """Test that a rebuilt database file is read instead of the old one."""
+        self.assertEqual(db.get_table_stats()['device'], 2)
+
+        # Replace the file, as a rebuild does, while the pool holds a connection
+        rebuilt_path = self.temp_db_path.with_suffix('.rebuilt')
+        with closing(sqlite3.connect(rebuilt_path)) as dest:
+            self.template_conn.backup(dest)
+            with dest:
+                dest.execute("DELETE FROM device WHERE row_hash = 'hash6'")
+        os.replace(rebuilt_path, self.temp_db_path)
+
+        self.assertEqual(db.get_table_stats()['device'], 1)
+
+    def test_read_connections_are_read_only(self):
+        """Test that pooled query connections cannot modify the database."""
+        with db._checkout() as conn, self.assertRaises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM foitext")
+
+        self.assertEqual(
+            len(db.query_local_database([['MRI']], search_field='foi_text')), 2,
+        )
+
+    def test_query_cache_hit(self):
+        """Test that an equivalent repeated query is served from the cache."""
+        first = db.query_local_database(
+            [['MRI', 'pacemaker']], search_field='foi_text', limit=10,
+        )
+        db._reset_pool()
+
+        with patch('maudecli.db.sqlite3.connect') as mock_connect:
+            second = db.query_local_database(
+                [['PACEMAKER', 'mri']], search_field='foi_text', limit=10,
+            )
+
+        mock_connect.assert_not_called()
+        self.assertEqual(first, second)
+
+        # Callers get their own copies of the cached rows
+        second[0]['foi_text'] = 'modified'
+        third = db.query_local_database(
+            [['MRI', 'pacemaker']], search_field='foi_text', limit=10,
+        )
+        self.assertEqual(first, third)
+
+    def test_query_cache_invalidated_when_database_changes(self):
+        """Test that cached results are not reused after the file changes."""
+        self.assertEqual(
+            len(db.query_local_database(
+                [['malfunction']], search_field='foi_text', limit=10,
+            )),
+            1,
+        )
+
+        with closing(sqlite3.connect(self.temp_db_path)) as conn, conn:
+            conn.execute(
+                "INSERT INTO foitext VALUES ('hash7', 'R007', 'Another malfunction')",
+            )
+        mtime = self.temp_db_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(self.temp_db_path, ns=(mtime, mtime))
+
+        self.assertEqual(
+            len(db.query_local_database(
+                [['malfunction']], search_field='foi_text', limit=10,
+            )),
+            2,
+        )
+
+    def test_query_cache_invalidated_when_database_replaced(self):
+        """Test that results are not reused after the file is replaced."""
+        self.assertEqual(
+            len(db.query_local_database(
+                [['pacemaker']], search_field='foi_text', limit=10,
+            )),
+            2,
+        )
+
+        # Rebuild into a new file with the same size and modification time
+        rebuilt_path = self.temp_db_path.with_suffix('.rebuilt')
+        with closing(sqlite3.connect(rebuilt_path)) as dest:
+            self.template_conn.backup(dest)
+            with dest:
+                dest.execute("DELETE FROM foitext WHERE row_hash = 'hash2'")
+        st = self.temp_db_path.stat()
+        self.assertEqual(rebuilt_path.stat().st_size, st.st_size)
+        os.utime(rebuilt_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(rebuilt_path, self.temp_db_path)
+
+        self.assertEqual(
+            len(db.query_local_database(
+                [['pacemaker']], search_field='foi_text', limit=10,
+            )),
+            1,
+        )
+
+    def test_unlimited_query_not_cached(self):
+        """Test that queries without a small limit are not kept in memory."""
+        db.query_local_database([['MRI']], search_field='foi_text')
+        db.query_local_database(
+            [['MRI']],
+            search_field='foi_text',
+            limit=db.CACHED_QUERY_MAX_LIMIT + 1,
+        )
+
+        self.assertEqual(db._QUERY_CACHE.cache_info().currsize, 0)
+
+    def test_sql_reused_for_same_query_shape(self):
+        """Test that queries differing only in term values share their SQL."""
+        db._query_sql.cache_clear()
+        db.query_local_database([['MRI', 'pacemaker']], search_field='foi_text')
+        results = db.query_local_database(
+            [['artifact', 'procedure']], search_field='foi_text',
+        )
+
+        self.assertEqual(db._query_sql.cache_info().currsize, 1)
+        self.assertEqual(len(results), 2)
+
+    def _create_fts_tables(self):
+        """Add the full-text indexes to the test database."""
+        with closing(sqlite3.connect(self.temp_db_path)) as conn:
+            db.create_fts_tables(conn)
+
+    def test_prefix_query_uses_index(self):
+        """Test that without FTS5, terms ending in * use the NOCASE index."""
+        with closing(sqlite3.connect(self.temp_db_path)) as conn:
+            db.create_indexes(conn, db.FTS_FALLBACK_INDEXES)
+
+        results = db.query_local_database([['brand*']], search_field='brand_name')
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            db.query_local_database([['MRI*']], search_field='brand_name'), [],
+        )
+
+        with closing(sqlite3.connect(self.temp_db_path)) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM device"
+                " WHERE brand_name LIKE ? ESCAPE '\\'",
+                (db._like_pattern('brand*'),),
+            ).fetchall()
+        self.assertIn('idx_device_brand_name', " ".join(row[-1] for row in plan))
+
+    def test_prefix_query_on_built_database_uses_fts(self):
+        """Test prefix terms on a database set up by create_tables."""
+        built_path = self.temp_db_path.with_suffix('.built')
+        self.addCleanup(built_path.unlink, missing_ok=True)
+        with closing(sqlite3.connect(built_path)) as conn:
+            db.create_tables(conn)
+            with conn:
+                conn.executemany(
+                    "INSERT INTO device (row_hash, brand_name, generic_name)"
+                    " VALUES (?, ?, ?)",
+                    DEVICE_ROWS,
+                )
+            if db._fts_table_for(conn.cursor(), 'device', 'brand_name') is None:
+                self.skipTest('SQLite was built without FTS5')
+        db.DB_PATH = built_path
+
+        # With the full-text index * matches the start of any word
+        self.assertEqual(
+            len(db.query_local_database([['brand*']], search_field='brand_name')),
+            2,
+        )
+        results = db.query_local_database([['MRI*']], search_field='brand_name')
+        self.assertEqual(
+            [r['brand_name'] for r in results], ['Brand A MRI Scanner'],
+        )
+
+    def test_like_wildcards_are_literal(self):
+        """Test that % and _ in search terms are not LIKE wildcards."""
+        self.assertEqual(
+            db.query_local_database([['MRI%Scanner']], search_field='brand_name'),
+            [],
+        )
+        self.assertEqual(
+            db.query_local_database([['A_MRI']], search_field='brand_name'), [],
+        )
+
+    def test_fts_query(self):
+        """Test that queries use the full-text index when it exists."""
+        self._create_fts_tables()
+
+        self.assertEqual(
+            len(db.query_local_database([['MRI']], search_field='foi_text')), 2,
+        )
+        self.assertEqual(
+            len(db.query_local_database(
+                [['MRI', 'pacemaker']], search_field='foi_text',
+            )),
+            3,
+        )
+        results = db.query_local_database(
+            [['MRI'], ['pacemaker']], search_field='foi_text',
+        )
+        self.assertEqual(len(results), 1)
+        self.assertIn('compatible', results[0]['foi_text'])
+
+        # Words are prefix queries, multi-word terms are exact phrases
+        for terms, expected in (
+            ([['pace*']], 2),
+            ([['pace']], 2),
+            ([['MRI compatible']], 1),
+            ([['compatible MRI']], 0),
+        ):
+            with self.subTest(terms=terms):
+                self.assertEqual(
+                    len(db.query_local_database(terms, search_field='foi_text')),
+                    expected,
+                )
+
+    def test_fts_device_query(self):
+        """Test that device name queries use their full-text index."""
+        self._create_fts_tables()
+
+        with patch('maudecli.db._fts_match_expression',
+                   wraps=db._fts_match_expression) as mock_match:
+            results = db.query_local_database(
+                [['scanner']], search_field='brand_name',
+            )
+
+        mock_match.assert_called()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['_source'], 'local_db:device')
+
+    def test_fts_exclusion_filtering(self):
+        """Test that exclusions are applied by the full-text MATCH."""
+        self._create_fts_tables()
+
+        results = db.query_local_database(
+            [['MRI']],
+            exclude_terms=[['artifact']],
+            search_field='foi_text'
+        )
+        self.assertEqual(len(results), 1)
+        self.assertIn('compatible', results[0]['foi_text'])
+
+    def test_fts_limited_query_is_ranked(self):
+        """Test that limited full-text queries return the best match first."""
+        self._create_fts_tables()
+
+        results = db.query_local_database(
+            [['pacemaker']], search_field='foi_text', limit=1,
+        )
+        self.assertEqual(len(results), 1)
+        # bm25 favours the shorter of the two matching records
+        self.assertEqual(results[0]['foi_text'], 'Patient received pacemaker')
+
+    def test_fts_limited_query_avoids_rank_scan(self):
+        """Test that ranking does not use the slow FTS5 rank-ordered scan."""
+        self._create_fts_tables()
+
+        with closing(sqlite3.connect(self.temp_db_path)) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN "
+                + db._fts_ranked_query('foitext', 'foitext_fts'),
+                ('{foi_text} : ("pacemaker")', 10, 1),
+            ).fetchall()
+
+        details = " ".join(row[-1] for row in plan)
+        self.assertIn('VIRTUAL TABLE INDEX', details)
+        self.assertNotIn('VIRTUAL TABLE INDEX 32:', details)
+
+    def test_fts_query_syntax_is_escaped(self):
+        """Test that FTS5 operators in terms are treated as plain text."""
+        self._create_fts_tables()
+
+        results = db.query_local_database(
+            [['"MRI', 'NOT', 'AND']], search_field='foi_text',
+        )
+        # Only the quoted "MRI" term matches any records
+        self.assertEqual(len(results), 2)
+
 
 class TestBuildScriptFunctions(unittest.TestCase):
     """Test suite for build script helper functions."""
@@ -203,6 +502,11 @@ class TestBuildScriptFunctions(unittest.TestCase):
         self.assertEqual(classify_file('DEVICE2000.ZIP'), 'device')
         self.assertEqual(classify_file('foitext1996.zip'), 'foitext')
         self.assertEqual(classify_file('foidev1998.zip'), 'foidev')
+        self.assertEqual(classify_file('foitextthru1995.zip'), 'foitext')
+        self.assertEqual(classify_file('FOIDEVTHRU1997.TXT'), 'foidev')
+        # foitext takes priority over foidev, which takes priority over device
+        self.assertEqual(classify_file('device_foitext.zip'), 'foitext')
+        self.assertEqual(classify_file('device_foidev.zip'), 'foidev')
         self.assertEqual(classify_file('readme.txt'), None)
         self.assertEqual(classify_file('unknown.csv'), None)
     
@@ -241,6 +545,27 @@ class TestBuildScriptFunctions(unittest.TestCase):
         # Different content should produce different hash
         self.assertNotEqual(hash1, hash3)
 
+    def test_compute_row_hashes_are_stable(self):
+        """Test that row hashes match the stored SHA256 serialization."""
+        import hashlib
+
+        import pandas as pd
+
+        df = pd.DataFrame({'a': ['value1', None], 'b': ['x', 'y'], 'c': [1, 2]})
+        hashes = db.compute_row_hashes(df)
+
+        self.assertEqual(
+            hashes.tolist(),
+            [
+                hashlib.sha256(b'value1|x|1').hexdigest(),
+                hashlib.sha256(b'|y|2').hexdigest(),
+            ],
+        )
+        self.assertEqual(
+            db.compute_row_hashes(df[['a', 'b']]).iloc[1],
+            hashlib.sha256(b'|y').hexdigest(),
+        )
+
 
 class TestDownloadFileFromUrl(unittest.TestCase):
     """Test suite for download_file_from_url function."""
@@ -349,6 +674,7 @@ class TestBuildDatabase(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test environment."""
+        db._reset_pool()
         db.DB_PATH = self.original_db_path
         db.CACHE_DIR = self.original_cache_dir
         db.DATAFILE_URLS = self.original_datafile_urls
@@ -418,22 +744,56 @@ class TestBuildDatabase(unittest.TestCase):
         asyncio.run(db.build_database())
         
         # Verify tables exist
-        conn = sqlite3.connect(db.DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' 
-            ORDER BY name
-        """)
-        tables = [row[0] for row in cursor.fetchall()]
-        
-        self.assertIn('device', tables)
-        self.assertIn('foitext', tables)
-        self.assertIn('foidev', tables)
-        self.assertIn('ingestion_log', tables)
-        
-        conn.close()
+        with closing(sqlite3.connect(db.DB_PATH)) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT name FROM sqlite_master 
+                WHERE type='table' 
+                ORDER BY name
+            """)
+            tables = [row[0] for row in cursor.fetchall()]
+
+            self.assertIn('device', tables)
+            self.assertIn('foitext', tables)
+            self.assertIn('foidev', tables)
+            self.assertIn('ingestion_log', tables)
+            for fts_table in db.FTS_TABLES:
+                self.assertIn(fts_table, tables)
+
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+            indexes = {row[0] for row in cursor.fetchall()}
+            for index in db.INDEXES:
+                self.assertIn(index, indexes)
+            # Name searches use the full-text indexes instead
+            for index in db.FTS_FALLBACK_INDEXES:
+                self.assertNotIn(index, indexes)
+
+    def test_create_tables_without_fts5_indexes_names(self):
+        """Test that name indexes are created when FTS5 is unavailable."""
+        class NoFTS5Cursor(sqlite3.Cursor):
+            def execute(self, sql, *args):
+                if 'USING fts5' in sql:
+                    raise sqlite3.OperationalError('no such module: fts5')
+                return super().execute(sql, *args)
+
+        class NoFTS5Connection(sqlite3.Connection):
+            def cursor(self, factory=NoFTS5Cursor):
+                return super().cursor(factory)
+
+        with closing(sqlite3.connect(
+            db.DB_PATH, factory=NoFTS5Connection,
+        )) as conn:
+            with self.assertLogs('maudecli.db', level='WARNING'):
+                db.create_tables(conn)
+            indexes = {
+                row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='index'",
+                )
+            }
+
+        for index in (*db.INDEXES, *db.FTS_FALLBACK_INDEXES):
+            self.assertIn(index, indexes)
 
     def test_build_database_downloads_files(self):
         """Test that build_database downloads files from URLs."""
@@ -456,6 +816,24 @@ class TestBuildDatabase(unittest.TestCase):
             # Verify download was called for each URL
             self.assertEqual(mock_download.call_count, len(test_urls))
 
+    def test_build_database_indexes_foi_text(self):
+        """Test that ingested text is searchable through the full-text index."""
+        test_urls = ("https://example.com/foitext2000.zip",)
+        db.DATAFILE_URLS = test_urls
+
+        with patch('maudecli.db.download_file_from_url') as mock_download:
+            async def mock_download_func(url):
+                filename = url.split("/")[-1]
+                return self._create_test_zip(filename, "foitext")
+
+            mock_download.side_effect = mock_download_func
+
+            asyncio.run(db.build_database())
+
+        results = db.query_local_database([['sample']], search_field='foi_text')
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['mdr_report_key'], 'R001')
+
     def test_build_database_handles_download_failures(self):
         """Test that build_database handles download failures gracefully."""
         test_urls = (
@@ -496,7 +874,7 @@ class TestBuildDatabase(unittest.TestCase):
             asyncio.run(db.build_database())
             
             # Verify data was ingested
-            with sqlite3.connect(db.DB_PATH) as conn:
+            with closing(sqlite3.connect(db.DB_PATH)) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("SELECT COUNT(*) FROM device")
@@ -504,9 +882,56 @@ class TestBuildDatabase(unittest.TestCase):
                 
                 # Should have ingested at least one row
                 self.assertGreater(count, 0)
+
+                # Planner statistics are refreshed after ingesting
+                cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE name='sqlite_stat1'",
+                )
+                self.assertIsNotNone(cursor.fetchone())
             
             
 
+    def test_build_database_parses_files_in_worker_processes(self):
+        """Test that multiple files are parsed by the worker pool."""
+        test_urls = (
+            "https://example.com/device2000.zip",
+            "https://example.com/foitext2000.zip",
+            "https://example.com/foidev2000.zip",
+        )
+        db.DATAFILE_URLS = test_urls
+
+        with patch('maudecli.db.download_file_from_url') as mock_download, \
+                patch('maudecli.db.MAX_PARSE_WORKERS', 2):
+            async def mock_download_func(url):
+                filename = url.split("/")[-1]
+                return self._create_test_zip(filename, filename[:-8])
+
+            mock_download.side_effect = mock_download_func
+
+            asyncio.run(db.build_database())
+
+        with closing(sqlite3.connect(db.DB_PATH)) as conn:
+            for table in ("device", "foitext", "foidev"):
+                count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                self.assertGreater(count, 0, table)
+
+    def test_worker_parse_errors_are_logged(self):
+        """Test that problems found by parse workers reach the parent's log."""
+        good = self._create_test_zip('device2000.zip', 'device')
+        empty = db.CACHE_DIR / 'foitext2000.zip'
+        with zipfile.ZipFile(empty, 'w') as zf:
+            zf.writestr('foitext2000.txt', '')
+
+        with patch('maudecli.db.MAX_PARSE_WORKERS', 2), \
+                self.assertLogs('maudecli.db', level='ERROR') as logs:
+            frames = list(db._parse_files([good, empty]))
+
+        self.assertIsNotNone(frames[0])
+        self.assertIsNone(frames[1])
+        self.assertTrue(
+            any('Error reading foitext2000.zip' in line for line in logs.output),
+        )
+
     def test_build_database_idempotency(self):
         """Test that build_database is idempotent (no duplicates on re-run)."""
         test_urls = ("https://example.com/device2000.zip",)
@@ -523,25 +948,54 @@ class TestBuildDatabase(unittest.TestCase):
             asyncio.run(db.build_database())
             
             # Get count after first run
-            conn = sqlite3.connect(db.DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM device")
-            count_first = cursor.fetchone()[0]
-            conn.close()
+            with closing(sqlite3.connect(db.DB_PATH)) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM device")
+                count_first = cursor.fetchone()[0]
             
             # Run build again
             asyncio.run(db.build_database())
             
             # Get count after second run
-            conn = sqlite3.connect(db.DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM device")
-            count_second = cursor.fetchone()[0]
-            conn.close()
+            with closing(sqlite3.connect(db.DB_PATH)) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM device")
+                count_second = cursor.fetchone()[0]
             
             # Counts should be the same (no duplicates)
             self.assertEqual(count_first, count_second)
 
+    def test_build_database_deduplicates_rows_within_file(self):
+        """Test that identical rows within one file are ingested once."""
+        test_urls = ("https://example.com/device2000.zip",)
+        db.DATAFILE_URLS = test_urls
+
+        with patch('maudecli.db.download_file_from_url') as mock_download:
+            async def mock_download_func(url):
+                zip_path = db.CACHE_DIR / url.split("/")[-1]
+                with zipfile.ZipFile(zip_path, 'w') as zf:
+                    zf.writestr(
+                        'device2000.txt',
+                        "BRAND_NAME|GENERIC_NAME\n"
+                        "Test Device|Generic Device\n"
+                        "Test Device|Generic Device\n"
+                        "Other Device|Generic Device\n",
+                    )
+                return zip_path
+
+            mock_download.side_effect = mock_download_func
+
+            asyncio.run(db.build_database())
+
+        with closing(sqlite3.connect(db.DB_PATH)) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM device").fetchone()[0]
+            logged = conn.execute(
+                "SELECT rows_ingested FROM ingestion_log",
+            ).fetchone()[0]
+
+        self.assertEqual(count, 2)
+        self.assertEqual(logged, 2)
+
     def test_build_database_handles_malformed_files(self):
         """Test that build_database handles malformed CSV files gracefully."""
         test_urls = ("https://example.com/device2000.zip",)
@@ -597,10 +1051,9 @@ class TestBuildDatabase(unittest.TestCase):
         asyncio.run(db.build_database())
         
         # Should be able to connect to database without conflicts
-        conn = sqlite3.connect(db.DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM device")
-        conn.close()
+        with closing(sqlite3.connect(db.DB_PATH)) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM device")
         
         # If connection wasn't closed properly, this would fail
 
@@ -9,6 +9,7 @@ including org-mode and CSV formatting.
 
 import csv
 import io
+import sys
 import unittest
 from typing import Any
 
@@ -98,6 +99,17 @@ class TestOrgFormatter(unittest.TestCase):
         output: str = formatters.as_org([])
         self.assertEqual(output, "")
 
+    def test_deeply_nested_structure(self) -> None:
+        """Test org-mode formatting of very deeply nested data.
+
+        Verifies that nesting deeper than the recursion limit is formatted.
+        """
+        value: dict[str, Any] | str = "deep"
+        for _ in range(sys.getrecursionlimit() + 10):
+            value = {"a": value}
+        output: str = formatters.as_org([{"report_number": "R123", "x": value}])
+        self.assertTrue(output.endswith("_A: deep\n:END:\n"))
+
 
 class TestCSVFormatter(unittest.TestCase):
     """Test suite for CSV formatter functionality.
@@ -198,6 +210,20 @@ class TestCSVFormatter(unittest.TestCase):
 
         self.assertEqual(rows[0]["description"], 'Report with "quotes", and, commas')
 
+    def test_stream_to_sink(self) -> None:
+        """Test CSV formatting written directly to a text stream.
+
+        Verifies that streamed output matches the returned string.
+        """
+        results: list[dict[str, Any]] = [
+            {"report_number": "R123", "notes": "line\r\nbreak"},
+            {"report_number": "R456"},
+        ]
+        sink = io.StringIO()
+
+        self.assertEqual(formatters.as_csv(results, sink=sink), "")
+        self.assertEqual(sink.getvalue(), formatters.as_csv(results))
+
 
 if __name__ == "__main__":
     unittest.main()